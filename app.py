@@ -21,6 +21,7 @@ from network.network_grid import NetworkGrid
 from network.sim.file import init_routingcubes_from_file
 from network.sim.recipe import Recipe
 from routing_algorithms.bellmanford import BellmanFordRouting, BellmanFordRobot
+from routing_algorithms.bellmanford_batched import seed_distance_tables
 import routing_algorithms.template as routet
 import robot_algorithm.template as robt
 
@@ -61,21 +62,39 @@ def _get_argparser() -> argparse.ArgumentParser:
         required=False,
         help="Network size, which is used to determine the maximum coordinates displayed."
     )
+    parser.add_argument(
+        "--converged",
+        action="store_true",
+        help="Start the nodes in the network file with converged distance tables (bmf only)."
+    )
     return parser
 
 
-def init_simulator(routing_algo_name:str, net_file_path:os.PathLike|None=None) -> NetworkGrid:
+def init_simulator(routing_algo_name:str, net_file_path:os.PathLike|None=None, converged:bool=False) -> NetworkGrid:
     """
     Initialize a NetworkGrid and populate it with the nodes specified in the given
     network file.
 
     :param routing_algo_name: string identifier of routing algorithm to use
     :param net_file_path: optional path to file containing network node information
+    :param converged: whether to seed the nodes' Bellman-Ford distance tables with the
+                      converged routes of the network, instead of letting them converge
+                      during the simulation
+    :raises ValueError: if converged is requested for a routing algorithm other than
+    Bellman-Ford
     :return: network simulator object
     """
+    if converged and routing_algo_name != "bmf":
+        raise ValueError(f"Converged distance tables are only supported by 'bmf', not '{routing_algo_name}'")
+
     # Instantiate routing and robot algorithm classes
     routing_alg_t, robo_alg_t = routing_algos[routing_algo_name]
-    routing_alg, robo_alg = routing_alg_t(), robo_alg_t()
+    routing_alg = routing_alg_t()
+    if robo_alg_t is BellmanFordRobot:
+        # Robots' cubes must share the address handles of the other cubes in the network
+        robo_alg = BellmanFordRobot(routing_alg)
+    else:
+        robo_alg = robo_alg_t()
 
     # Main grid
     grid = NetworkGrid(routing_alg, robo_alg)
@@ -85,7 +104,10 @@ def init_simulator(routing_algo_name:str, net_file_path:os.PathLike|None=None) -
         cubes = init_routingcubes_from_file(net_file_path)
         for cube in cubes:
             x, y, z = cube.position
-            grid.add_node(x, y, z, cube)
+            grid.add_node(x, y, z, cube.id, cube)
+
+        if converged:
+            seed_distance_tables(grid)
 
     return grid
 
@@ -95,8 +117,11 @@ def main(argv):
     parser = _get_argparser()
     cliargs = parser.parse_args(argv)
 
+    if cliargs.converged and cliargs.algorithm != "bmf":
+        parser.error(f"--converged is only supported by 'bmf', not '{cliargs.algorithm}'")
+
     # Initialization
-    simulator = init_simulator(cliargs.algorithm, cliargs.network)
+    simulator = init_simulator(cliargs.algorithm, cliargs.network, cliargs.converged)
     if cliargs.recipe is not None:
         recipe = Recipe.from_file(cliargs.recipe)
     else:
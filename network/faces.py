@@ -13,12 +13,28 @@ class Direction(Enum):
     NORTH = 4
     SOUTH = 5
 
+# All directions, indexed by Direction.value
+ALL_DIRECTIONS = tuple(Direction)
+
+# Opposite of each direction, indexed by Direction.value
+OPPOSITE_DIRECTIONS = (
+    Direction.DOWN, Direction.UP,
+    Direction.EAST, Direction.WEST,
+    Direction.SOUTH, Direction.NORTH,
+)
+
 class Face:
+    __slots__ = ("_rx_buffer", "on_rx")
+
     def __init__(self) -> None:
         self._rx_buffer = list()
+        # optional callback invoked whenever a packet is buffered on this face
+        self.on_rx: typing.Callable[[], typing.Any]|None = None
 
     def buffer_pkt(self, packet:typing.Any):
         self._rx_buffer.append(packet)
+        if self.on_rx is not None:
+            self.on_rx()
 
     def get_buffered_pkts(self) -> list[typing.Any]:
         pkts = self._rx_buffer.copy()
@@ -29,6 +45,8 @@ class Face:
         return len(self._rx_buffer) > 0
 
 class Faces:
+    __slots__ = ("faces",)
+
     def __init__(self, create_faces: bool=True) -> None:
         if create_faces:
             self.faces = [Face() for _ in range(6)]
@@ -41,6 +59,15 @@ class Faces:
             self.faces[direction.value].buffer_pkt(packet)
             return True
         return False
+
+    def broadcast_packet(self, packet) -> int:
+        # buffer the same packet on every face that exists
+        sent = 0
+        for face in self.faces:
+            if face is not None:
+                face.buffer_pkt(packet)
+                sent += 1
+        return sent
     
     def get_face_packet(self, direction: Direction):
         return self.faces[direction.value].pkt_rx
@@ -50,9 +77,9 @@ class Faces:
     
     def get_all_packets(self) -> list[tuple[typing.Any, Direction]]:
         packets = list()
-        for dir, face in enumerate(self.faces):
+        for dir, face in zip(ALL_DIRECTIONS, self.faces):
             for pkt in face.get_buffered_pkts():
-                packets.append((pkt, Direction(dir)))
+                packets.append((pkt, dir))
         return packets
     
     def has_packet(self) -> bool:
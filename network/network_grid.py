@@ -5,6 +5,8 @@ remove_node_by_id(), and send_packet_by_coords(). Added id argument to add_node(
 add_robot().
 """
 
+import functools
+
 from .routing_cube import RoutingCube
 from .faces import Direction
 from typing import Dict
@@ -31,6 +33,9 @@ class NetworkGrid:
         # List of all robots in the network
         self.robot_list = []
 
+        # Nodes that have received packets which have not been flushed yet
+        self._rx_pending: set[RoutingCube] = set()
+
         self.routing_algorithm = routing_algorithm
         self.robot_algorithm = robot_algorithm
     
@@ -64,6 +69,11 @@ class NetworkGrid:
         self.node_map[(x, y, z)] = node
     
         self.node_list.append(node)
+
+        # have the node report received packets so that only those nodes get flushed
+        notify_rx = functools.partial(self._rx_pending.add, node)
+        for face in node.faces.faces:
+            face.on_rx = notify_rx
         
         # check if this layer exists
         if z not in self.layer_entry_points.keys():
@@ -131,6 +141,7 @@ class NetworkGrid:
         self.node_map.pop((x, y, z))
         
         self.node_list.remove(node)
+        self._rx_pending.discard(node)
         
         # remove linked list references
         # z direction
@@ -156,6 +167,9 @@ class NetworkGrid:
         west = self.get_node(x-1, y, z)
         if west is not None:
             west.ll_references.set_face(Direction.EAST, None)
+        
+        # run power off code for the node
+        self.routing_algorithm.power_off(node)
 
     def remove_node_by_id(self, id:int|str):
         node = self.get_node_by_id(id)
@@ -204,14 +218,20 @@ class NetworkGrid:
         return self.node_list
     
     def step(self):
+        # Call the algorithms directly rather than going through RoutingCube.step() and
+        # Robot.step(), which only forward to them
+        route = self.routing_algorithm.route
         for node in self.node_list:
-            node.step(self.routing_algorithm)
+            route(node)
         
-        for node in self.node_list:
+        # Only nodes that actually received packets need their buffers flushed
+        for node in self._rx_pending:
             node.flush_buffers()
+        self._rx_pending.clear()
             
+        robot_step = self.robot_algorithm.step
         for robot in self.robot_list:
-            robot.step(self.robot_algorithm)
+            robot_step(robot)
 
     def send_packet(self, data, src_id:int|str, dest_id:int|str):
         src_node = self.get_node_by_id(src_id)
@@ -5,10 +5,10 @@ Face).
 [MD] 4/16/24 RoutingCube IDs implemented.
 """
 
-import queue
+import collections
 import typing
 
-from .faces import Faces, Direction
+from .faces import Faces, Direction, ALL_DIRECTIONS
 
 
 class RoutingCube:
@@ -16,6 +16,11 @@ class RoutingCube:
     _ID_NODE_DNE = -1
     MAX_Q_LEN = 64
 
+    __slots__ = (
+        "position", "id", "faces", "ll_references", "_packets", "data",
+        "num_pkts_received", "num_pkts_dropped", "highest_q_len",
+    )
+
     def __init__(self, position: tuple[int, int, int] = (0, 0, 0), id:int|str|None=None) -> None:
         # position of this cube in the lattice
         self.position = position
@@ -33,8 +38,8 @@ class RoutingCube:
         # references to faces of adjacent cubes
         self.ll_references = Faces(create_faces=False)
 
-        # queue for packets received by this cube
-        self._packets = queue.Queue(maxsize=RoutingCube.MAX_Q_LEN)
+        # queue for packets received by this cube (holds at most MAX_Q_LEN packets)
+        self._packets = collections.deque()
 
         # custom data stored in this cube for use by routing algorithms
         self.data = None
@@ -47,6 +52,14 @@ class RoutingCube:
     def send_packet(self, direction: Direction, packet):
         # check if the face is connected to another cube
         return self.ll_references.add_packet(direction, packet)
+
+    def broadcast(self, packet) -> int:
+        """
+        Sends the same packet object to every connected neighbor.
+
+        :return: number of neighbors the packet was sent to
+        """
+        return self.ll_references.broadcast_packet(packet)
     
     def get_packet(self) -> tuple[typing.Any, Direction]|tuple[None, None]:
         """
@@ -55,13 +68,28 @@ class RoutingCube:
 
         :return: packet, RX direction
         """
-        if not self._packets.empty():
-            return self._packets.get_nowait()
+        if self._packets:
+            return self._packets.popleft()
         else:
             return None, None
         
+    def drain_packets(self, max_pkts:int|None=None) -> list[tuple[typing.Any, Direction]]:
+        """
+        Removes packets from the front of the queue, along with the directions
+        representing the cube faces they were received on.
+
+        :param max_pkts: maximum number of packets to remove, or None to empty the queue
+        :return: list of (packet, RX direction) in the order they were received
+        """
+        packets = self._packets
+        if max_pkts is None or max_pkts >= len(packets):
+            drained = list(packets)
+            packets.clear()
+            return drained
+        return [packets.popleft() for _ in range(max_pkts)]
+        
     def has_packet(self) -> bool:
-        return not self._packets.empty()
+        return len(self._packets) > 0
 
     # def set_face(self, direction: Direction, face):
     #     self.faces.set_face(direction, face)
@@ -76,17 +104,17 @@ class RoutingCube:
 
         for pkt in received:
             self.num_pkts_received += 1
-            try:
-                self._packets.put_nowait(pkt)
-            except queue.Full:
+            if len(self._packets) < RoutingCube.MAX_Q_LEN:
+                self._packets.append(pkt)
+            else:
                 # Packet lost
                 self.num_pkts_dropped += 1
 
             # Track highest recorded queue length
-            q_len = self._packets.qsize()
+            q_len = len(self._packets)
             if q_len > self.highest_q_len:
                 self.highest_q_len = q_len
         
     def __repr__(self) -> str:
-        packets = [f"{Direction(i).name}: {self.faces.face_has_packet(Direction(i))}" for i in range(6)]
+        packets = [f"{dir.name}: {self.faces.face_has_packet(dir)}" for dir in ALL_DIRECTIONS]
         return f"RoutingCube at {self.position}: {packets}"
\ No newline at end of file
@@ -43,12 +43,16 @@ The following commands are allowed in recipe files:
 """
 
 import enum
-import io
 import os
+import re
+import types
 import typing
 
 from network.network_grid import NetworkGrid
 
+_INT_PATTERN = re.compile(r"[+-]?\d+")
+"""Matches recipe arguments that should be converted to integers."""
+
 
 class RecipeComm(enum.Enum):
     """
@@ -75,22 +79,14 @@ class RecipeComm(enum.Enum):
     
 
     @classmethod
-    def expected_arg_counts(cls) -> dict[tuple[int]]:
-        """
-        Generates a dictionary of the expected argument counts for each valid command.
-
-        :return: RecipeComm : int dictionary
-        """
-        return {
-            cls.ADDN : (3,4),
-            cls.ADDR : (3,4),
-            cls.RMVN : (3,1),
-            cls.SEND : (7,3),
-            cls.WAIT : (1,),
-            cls.LOOP : (1,),
-            cls.ENDL : (0,),
-            cls.PAUSE : (0,),
-        }
+    def expected_arg_counts(cls) -> types.MappingProxyType["RecipeComm", tuple[int, ...]]:
+        """
+        Gets a read-only dictionary of the expected argument counts for each valid
+        command.
+
+        :return: read-only RecipeComm : tuple of allowed argument counts mapping
+        """
+        return _ARG_COUNTS
     
 
     def num_args_expected(self) -> tuple[int]:
@@ -101,19 +97,36 @@ class RecipeComm(enum.Enum):
         dictionary returned by expected_arg_counts() (for development purposes)
         :return: expected argument counts of this command
         """
-        arg_nums = RecipeComm.expected_arg_counts()
         try:
-            return arg_nums[self]
+            return _ARG_COUNTS[self]
         except KeyError:
             raise NotImplementedError(f"Expected argument number not implemented for recipe command '{self}'")
 
 
+# Expected argument counts for each recipe command, built once at import
+_ARG_COUNTS = types.MappingProxyType({
+    RecipeComm.ADDN : (3,4),
+    RecipeComm.ADDR : (3,4),
+    RecipeComm.RMVN : (3,1),
+    RecipeComm.SEND : (7,3),
+    RecipeComm.WAIT : (1,),
+    RecipeComm.LOOP : (1,),
+    RecipeComm.ENDL : (0,),
+    RecipeComm.PAUSE : (0,),
+})
+
+
 class Recipe:
     """
     Class that represents and executes a set of instructions for network simulation using
     a NetworkGrid.
     """
 
+    __slots__ = (
+        "commands", "command_args", "idx", "length", "wait_cycles_remaining",
+        "loop_iters_remaining", "loop_idx", "in_loop", "paused", "_handlers",
+    )
+
     def __init__(self, commands:typing.Iterable[RecipeComm], command_args:typing.Iterable[typing.Iterable]):
         """
         Initialize a recipe with the given steps.
@@ -140,6 +153,9 @@ class Recipe:
 
         self.paused = False                    # Whether the recipe is paused until user input is given
 
+        # Handling method for each command, bound once rather than looked up per command
+        self._handlers = {comm : getattr(self, f"handle_{comm.name}") for comm in RecipeComm}
+
 
     @classmethod
     def from_file(cls, f:os.PathLike, check_arg_count:bool=True):
@@ -155,51 +171,38 @@ class Recipe:
         commands = list()
         command_args = list()
 
+        # Lines are read one at a time rather than loading the whole file up front
         with open(f) as fd:
-            data = fd.readlines()
+            for linenum, line in enumerate(fd, start=1):
+                # Skip empty lines and commented lines
+                line = line.strip()
+                if len(line) == 0 or line.startswith('#'):
+                    continue
 
-        for linenum, line in enumerate(data, start=1):
-            # Skip empty lines
-            line = line.strip()
-            if len(line) == 0:
-                continue
-        
-            # Split line on space delimiter
-            items = line.split(' ')
-
-            # Skip commented lines
-            if items[0] == '#':
-                continue
-
-            # Get command and arguments from line items
-            comm = items[0]
-            args = items[1:]
-
-            # Convert command to RecipeComm
-            try:
-                comm = RecipeComm[comm]
-            except KeyError:
-                e = ValueError(f"Invalid recipe file: invalid command '{comm}'")
-                e.add_note(f"(line {linenum} in {f})")
-                raise e
-
-            # Convert arguments to int if able
-            for i, arg in enumerate(args):
-                try:
-                    args[i] = int(arg)
-                except ValueError:
-                    pass
-            
-            # Check argument count
-            if check_arg_count:
+                # Split line on whitespace, then get command and arguments from line items
+                comm, *args = line.split()
+
+                # Convert command to RecipeComm
                 try:
-                    cls._check_arg_count(comm, args)
-                except ValueError as e:
+                    comm = RecipeComm[comm]
+                except KeyError:
+                    e = ValueError(f"Invalid recipe file: invalid command '{comm}'")
                     e.add_note(f"(line {linenum} in {f})")
                     raise e
 
-            commands.append(comm)
-            command_args.append(args)
+                # Convert arguments to int if able
+                args = [int(arg) if _INT_PATTERN.fullmatch(arg) else arg for arg in args]
+
+                # Check argument count
+                if check_arg_count:
+                    try:
+                        cls._check_arg_count(comm, args)
+                    except ValueError as e:
+                        e.add_note(f"(line {linenum} in {f})")
+                        raise e
+
+                commands.append(comm)
+                command_args.append(args)
 
         return cls(commands, command_args)
     
@@ -215,9 +218,10 @@ class Recipe:
         :raises ValueError: if the length of args is not equal to the number of expected
         arguments for comm
         """
-        if len(args) not in comm.num_args_expected():
+        expected = comm.num_args_expected()
+        if len(args) not in expected:
             raise ValueError(
-                f"Invalid number of arguments for recipe command '{comm.name}': expected {comm.num_args_expected()}, got {len(args)}"
+                f"Invalid number of arguments for recipe command '{comm.name}': expected {expected}, got {len(args)}"
             )
 
 
@@ -368,24 +372,11 @@ class Recipe:
         """
         Recipe._check_arg_count(comm, args)
 
-        if comm == RecipeComm.ADDN:
-            self.handle_ADDN(netgrid, *args)
-        elif comm == RecipeComm.ADDR:
-            self.handle_ADDR(netgrid, *args)
-        elif comm == RecipeComm.RMVN:
-            self.handle_RMVN(netgrid, *args)
-        elif comm == RecipeComm.SEND:
-            self.handle_SEND(netgrid, *args)
-        elif comm == RecipeComm.WAIT:
-            self.handle_WAIT(netgrid, *args)
-        elif comm == RecipeComm.LOOP:
-            self.handle_LOOP(netgrid, *args)
-        elif comm == RecipeComm.ENDL:
-            self.handle_ENDL(netgrid, *args)
-        elif comm == RecipeComm.PAUSE:
-            self.handle_PAUSE(netgrid, *args)
-        else:
+        try:
+            handler = self._handlers[comm]
+        except KeyError:
             raise ValueError(f"Unsupported recipe command: '{comm}'")
+        handler(netgrid, *args)
 
 
     def execute_next(self, netgrid:NetworkGrid):
@@ -428,10 +419,9 @@ class Recipe:
 
 
     def __str__(self) -> str:
-        with io.StringIO() as sio:
-            sio.write("Recipe:")
-            for comm, args in zip(self.commands, self.command_args):
-                sio.write(f"\n  {comm.name}")
-                for arg in args:
-                    sio.write(" " + str(arg))
-            return sio.getvalue()
+        lines = ["Recipe:"]
+        lines.extend(
+            " ".join([f"  {comm.name}", *map(str, args)])
+            for comm, args in zip(self.commands, self.command_args)
+        )
+        return "\n".join(lines)
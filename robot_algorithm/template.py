@@ -1,11 +1,14 @@
 from .robot_algorithm import RobotAlgorithm
 from network.robot import Robot
-from network.faces import Direction
+from network.faces import ALL_DIRECTIONS
 from dataclasses import dataclass
-import random
+import numpy as np
+
+# number of random values generated at a time by the template algorithm
+RNG_BATCH_SIZE = 4096
 
 # data stored in a robot 
-@dataclass
+@dataclass(slots=True)
 class RobotData:
     # current step count
     step: int = 0
@@ -13,19 +16,31 @@ class RobotData:
 class Template(RobotAlgorithm):
     def __init__(self) -> None:
         super().__init__()
+        # random packet data and faces are generated in batches rather than one at a time
+        self._rng = np.random.default_rng()
+        self._refill_random()
+
+    def _refill_random(self) -> None:
+        self._rand_data = self._rng.integers(0, 101, RNG_BATCH_SIZE).tolist()
+        self._rand_faces = self._rng.integers(0, 6, RNG_BATCH_SIZE).tolist()
+        self._rand_idx = 0
         
     def step(self, robot: Robot) -> None:
         # demo robot algorithm that just sends sends a packet
         # containing random data out of a random face once every few time steps
         
         if robot.cube.data.step % 2 == 0:
-            packetData = random.randint(0, 100)
+            if self._rand_idx == RNG_BATCH_SIZE:
+                self._refill_random()
+            packetData = self._rand_data[self._rand_idx]
+            face = self._rand_faces[self._rand_idx]
+            self._rand_idx += 1
+
             packet = {"data": packetData}
-            face = random.randint(0, 5)
-            robot.send_packet(Direction(face), packet)
+            robot.send_packet(ALL_DIRECTIONS[face], packet)
 
         robot.cube.data.step += 1
     
     def power_on(self, robot: Robot) -> None:
         robot.cube.data = RobotData()
-        robot.cube.data.step = 0
\ No newline at end of file
+        robot.cube.data.step = 0
@@ -3,29 +3,127 @@
 file: bellmanford.py
 author: Mark Danza
 
-Consumes a maximum of one packet from each node queue per simulation cycle and processes
-or routes it according to the Bellman-Ford algorithm.
+Consumes a maximum of BMF_MAX_PKTS_PER_CYCLE packets from each node queue per simulation
+cycle and processes or routes them according to the Bellman-Ford algorithm.
 """
 
 import dataclasses
+import enum
+import heapq
 import typing
+import weakref
+
+import numpy as np
 
 from network.robot import Robot
 from network.routing_cube import RoutingCube
-from network.faces import Direction
+from network.faces import ALL_DIRECTIONS, Direction
 from robot_algorithm.robot_algorithm import RobotAlgorithm
 from routing_algorithms.helpers import node_addr_t, node_pos_t, determine_tx_dir, determine_tx_pos
 from routing_algorithms.routing_algorithm import RoutingAlgorithm
 
 BMF_DEFAULT_LINK_COST = 1
+BMF_NO_ROUTE = np.iinfo(np.int32).max # Distance table entry for a destination that cannot be reached via a neighbor
+BMF_INIT_TBL_ROWS = 16                # Minimum initial number of destinations a distance table can hold
+BMF_FULL_DV_INTERVAL = 16             # Cycles between the full distance vector broadcasts that repair lost deltas
+BMF_FULL_DV_REPEATS = 3               # Full distance vectors sent after each distance vector change (0 to disable them)
+BMF_MAX_PKTS_PER_CYCLE = 1            # Packets each node processes per cycle (None for its whole queue)
+
+addr_handle_t: typing.TypeAlias = int
+"""Typemark for integer handles that stand in for node addresses."""
+
+
+class AddrHandles:
+    """
+    Assigns integer handles to the node addresses of one simulation. Handles are shared
+    by all distance tables created with the same AddrHandles, so distance vectors keyed
+    by handle can be applied directly by any node of the simulation.
+    """
+
+    __slots__ = ("_handles", "_num_handles", "_free_handles", "_tables")
+
+    def __init__(self):
+        self._handles: dict[node_addr_t, addr_handle_t] = dict() # Handle of each address in the network
+        self._num_handles = 0                                      # Number of handles assigned so far, including released ones
+        self._free_handles: list[addr_handle_t] = list()          # Heap of released handles that can be reused
+        self._tables: "weakref.WeakSet[DistanceTbl]" = weakref.WeakSet() # Distance tables that use these handles
+
+
+    def __len__(self) -> int:
+        return len(self._handles)
+
+
+    def get(self, addr:node_addr_t) -> addr_handle_t|None:
+        """
+        Look up the handle of the given node address without assigning one.
+
+        :param addr: node address
+        :return: handle of addr, or None if the address has no handle
+        """
+        return self._handles.get(addr)
+
+
+    def assign(self, addr:node_addr_t) -> addr_handle_t:
+        """
+        Get the handle for the given node address, assigning the smallest unused handle if
+        the address does not have one yet.
+
+        :param addr: node address
+        :return: handle of addr
+        """
+        handle = self._handles.get(addr)
+        if handle is None:
+            if self._free_handles:
+                handle = heapq.heappop(self._free_handles)
+                # Routes to the released address must not be mistaken for routes to this one
+                for tbl in self._tables:
+                    tbl.forget_handle(handle)
+            else:
+                handle = self._num_handles
+                self._num_handles += 1
+            self._handles[addr] = handle
+        return handle
+
+
+    def release(self, addr:node_addr_t):
+        """
+        Release the handle of a node address that is no longer in the network, so that the
+        handle can be reused and the address is no longer referenced. Has no effect if the
+        address has no handle.
+
+        :param addr: node address
+        """
+        handle = self._handles.pop(addr, None)
+        if handle is not None:
+            heapq.heappush(self._free_handles, handle)
+
+
+    def add_table(self, tbl:"DistanceTbl"):
+        """
+        Register a distance table so that it forgets handles before they are reused.
+
+        :param tbl: distance table using these handles
+        """
+        self._tables.add(tbl)
 
-@dataclasses.dataclass
+
+class DVUpdate(enum.IntEnum):
+    """
+    Distance vector broadcast needed after handling a packet. Larger values take
+    precedence when several packets are handled in the same cycle.
+    """
+    NONE = 0
+    DELTA = 1
+    FULL = 2
+
+
+@dataclasses.dataclass(slots=True, eq=False)
 class BMFPkt:
     src_addr : node_addr_t
     dest_addr : node_addr_t|None
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True, eq=False)
 class BMFNewNeighborPkt(BMFPkt):
     """
     Special packet type used when a node is powered on to notify its neighbors of its
@@ -35,15 +133,22 @@ class BMFNewNeighborPkt(BMFPkt):
     ack : bool = False
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True, eq=False)
 class BMFDistanceVectorPkt(BMFPkt):
     """
-    Special packet type used to send distance vectors to a node's neighbors.
+    Special packet type used to send distance vectors to a node's neighbors. The vector
+    is split into parallel arrays of destination address handles (sorted) and costs. It
+    may be a delta containing only the destinations whose cost changed, in which case a
+    cost of BMF_NO_ROUTE means the destination is no longer reachable via the sender. A
+    full vector lists every destination the sender can reach, so any destination missing
+    from it is unreachable via the sender.
     """
-    vector: dict[node_addr_t, int]
+    ids: np.ndarray
+    costs: np.ndarray
+    full: bool = False
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True, eq=False)
 class BMFDataPkt(BMFPkt):
     """
     Generic packet type with a data payload.
@@ -51,68 +156,200 @@ class BMFDataPkt(BMFPkt):
     payload: typing.Any
 
 
+def _double_rows(array:np.ndarray, fill:int) -> np.ndarray:
+    """
+    Helper function for growing a distance table array.
+
+    :param array: array to grow
+    :param fill: value for the new rows
+    :return: copy of array with twice as many rows, where the new rows contain fill
+    """
+    grown = np.full((2 * len(array), *array.shape[1:]), fill, dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
+
+
 class DistanceTbl:
     """
     Bellman-Ford Distance Table
+
+    Distances are stored in a 2D array with one row per destination address handle and
+    one column per neighbor direction, so the cost to reach a destination via the
+    neighbor on a given face is _distances[addr_handles.get(dest), direction.value].
     """
+
+    __slots__ = (
+        "my_addr", "my_pos", "_my_handle", "_distances", "_min_distances", "_best_cols",
+        "_neighbor_handles", "_neighbor_pos", "_sent_distances", "_dv_cache", "_addr_handles",
+        "__weakref__",
+    )
     
-    def __init__(self, my_addr:node_addr_t, my_pos:node_pos_t):
+    def __init__(self, my_addr:node_addr_t, my_pos:node_pos_t, addr_handles:AddrHandles):
         """
         Create a distance table for a specific node.
 
         :param my_addr: address of the node that owns this distance table
         :param my_pos: coordinates of the node that owns this distance table
+        :param addr_handles: address handles of the simulation the node belongs to
         """
         self.my_addr = my_addr
-        self._distances = dict()         # Internal distance table data
-        self._neighbor_addr_pos = dict() # Mapping of neighbor node addresses to positions
+        self.my_pos = my_pos
+        self._addr_handles = addr_handles
+        self._my_handle = addr_handles.assign(my_addr)
+        # Presize the table for every node currently in the network, since the table will
+        # most likely have to hold all of them
+        rows = max(BMF_INIT_TBL_ROWS, len(addr_handles))
+        self._distances = np.full((rows, len(Direction)), BMF_NO_ROUTE, dtype=np.int32) # Internal distance table data
+        self._min_distances = np.full(rows, BMF_NO_ROUTE, dtype=np.int32) # Minimum of each table row
+        self._best_cols = np.zeros(rows, dtype=np.intp)                    # Column of the minimum of each table row
+        self._neighbor_handles = [None] * len(Direction) # Address handle of the neighbor node in each direction
+        self._neighbor_pos = [None] * len(Direction)     # Position of the neighbor node in each direction
+        self._sent_distances = np.full(rows, BMF_NO_ROUTE, dtype=np.int32) # Minimum distances as of the last distance vector delta
+        self._dv_cache = None # Distance vector generated from the current table contents, or None if out of date
+        addr_handles.add_table(self)
 
 
-    def new_neighbor(self, addr:node_addr_t, pos:node_pos_t, link_cost:int):
+    def _ensure_rows(self, max_handle:addr_handle_t):
+        """
+        Grow the table if necessary so that it has a row for every handle up to and
+        including max_handle.
+
+        :param max_handle: largest handle that needs a row
+        """
+        while max_handle >= len(self._distances):
+            self._distances = _double_rows(self._distances, BMF_NO_ROUTE)
+            self._min_distances = _double_rows(self._min_distances, BMF_NO_ROUTE)
+            self._sent_distances = _double_rows(self._sent_distances, BMF_NO_ROUTE)
+            self._best_cols = _double_rows(self._best_cols, 0)
+
+
+    def _refresh_minimums(self, rows:slice|np.ndarray|list[int]) -> bool:
+        """
+        Recompute the minimum distance and best column of the given table rows after
+        they have been written. The cached distance vector is invalidated if any minimum
+        distance changed.
+
+        :param rows: indices of the rows that changed
+        :return: True if any minimum distance changed, otherwise False
+        """
+        changed = self._distances[rows]
+        new_mins = changed.min(axis=1)
+        self._best_cols[rows] = changed.argmin(axis=1)
+        if np.array_equal(self._min_distances[rows], new_mins):
+            return False
+        self._min_distances[rows] = new_mins
+        self._dv_cache = None
+        return True
+
+
+    def forget_handle(self, handle:addr_handle_t):
+        """
+        Remove all routes to and via the node with the given handle, because the handle
+        is being reused for a different node.
+
+        :param handle: released address handle
+        """
+        if handle >= len(self._distances):
+            return
+        self._distances[handle] = BMF_NO_ROUTE
+        self._sent_distances[handle] = BMF_NO_ROUTE
+        for col, neighbor_handle in enumerate(self._neighbor_handles):
+            if neighbor_handle == handle:
+                self._distances[:, col] = BMF_NO_ROUTE
+                self._neighbor_handles[col] = None
+                self._neighbor_pos[col] = None
+        self._refresh_minimums(slice(None))
+
+
+    def new_neighbor(self, addr:node_addr_t, pos:node_pos_t, link_cost:int) -> bool:
         """
         Update the distance table with a neighbor node (i.e., distance to addr via itself
         is link_cost).
 
         :param addr: neighbor node address
+        :param pos: neighbor node position
         :param link_cost: distance from this node to neighbor node
-        """
-        # Create dict for the neighbor if it is new
-        if addr not in self._distances:
-            self._distances[addr] = dict()
+        :return: True if this node's distance vector changed, otherwise False
+        """
+        # Every node in the network has a handle, so a neighbor without one has left the
+        # network since it sent the notification
+        handle = self._addr_handles.get(addr)
+        if handle is None:
+            return False
+        col = determine_tx_dir(self.my_pos, pos).value
+        self._ensure_rows(handle)
+        changed = False
+        # A different node in the same direction replaces the old neighbor, so routes via
+        # the old neighbor are no longer valid
+        if self._neighbor_handles[col] != handle:
+            self._distances[:, col] = BMF_NO_ROUTE
+            changed = self._refresh_minimums(slice(None))
+            self._neighbor_handles[col] = handle
+            self._neighbor_pos[col] = pos
         # Distance to new neighbor via new neighbor is equal to specified link cost
-        self._distances[addr][addr] = link_cost
-        # Add neighbor addr and pos to dict
-        self._neighbor_addr_pos[addr] = pos
+        if self._distances[handle, col] != link_cost:
+            self._distances[handle, col] = link_cost
+            changed = self._refresh_minimums([handle]) or changed
+        return changed
 
 
-    def update(self, distance_vector:dict[node_addr_t, int], via:node_addr_t, via_pos:node_pos_t):
+    def update(self, ids:np.ndarray, costs:np.ndarray, via:node_addr_t, via_pos:node_pos_t, full:bool=False) -> bool:
         """
         Update the distance table using a distance vector received from a neighbor node
         (i.e., distance to destination via neighbor is distance from neighbor to
         destination plus distance to neighbor).
 
-        :param distance_vector: mapping of destination addresses to partial link costs
-        :param via: neighbor node address (address of the node to which the distances in
-                    distance_vector are related))
+        :param ids: destination address handles of the distance vector
+        :param costs: partial link cost to each destination in ids
+        :param via: neighbor node address (address of the node that sent ids and costs)
         :param via_pos: neighbor node position in case it needs to be added to this
                         node's known neighbors
+        :param full: whether the distance vector is the neighbor's full vector, in which
+                     case destinations missing from it become unreachable via the neighbor
+        :return: True if this node's distance vector changed, otherwise False
         """
-        # If the neighbor not is not yet known, add it
-        if via not in self._distances:
-            self.new_neighbor(via, via_pos, BMF_DEFAULT_LINK_COST)
-
-        # Iterate over destinations and corresponding distances thru the neighbor node
-        for dest, distance in distance_vector.items():
-            # Skip destination if it is myself
-            if dest != self.my_addr:
+        # Ignore distance vectors from neighbors that have left the network since sending them
+        via_handle = self._addr_handles.get(via)
+        if via_handle is None:
+            return False
+        col = determine_tx_dir(self.my_pos, via_pos).value
+        changed = False
 
-                # Create dict for the destination if it is new
-                if dest not in self._distances:
-                    self._distances[dest] = dict()
-
-                # Distance to destination thru neighbor = distance from neighbor to dest + link cost to neighbor
-                link_cost_to_via = self._distances[via][via]
-                self._distances[dest][via] = distance + link_cost_to_via
+        # If the neighbor not is not yet known, add it
+        if self._neighbor_handles[col] != via_handle:
+            changed = self.new_neighbor(via, via_pos, BMF_DEFAULT_LINK_COST)
+        link_cost_to_via = self._distances[via_handle, col]
+
+        # Skip the destination if it is myself
+        not_me = ids != self._my_handle
+        dests, distances = ids[not_me], costs[not_me]
+        if len(dests) == 0 and not full:
+            return changed
+        if len(dests) > 0:
+            self._ensure_rows(dests[-1])
+
+        # Distance to destination thru neighbor = distance from neighbor to dest + link cost to neighbor
+        # (unless the neighbor reported that it no longer has a route)
+        new_distances = np.where(distances == BMF_NO_ROUTE, BMF_NO_ROUTE, distances + link_cost_to_via)
+
+        if full:
+            # Replace the whole column, keeping only the link to the neighbor itself, so
+            # that routes the neighbor no longer has are dropped even if the delta
+            # withdrawing them was lost
+            column = np.full(len(self._distances), BMF_NO_ROUTE, dtype=self._distances.dtype)
+            column[via_handle] = link_cost_to_via
+            column[dests] = new_distances
+            rows = np.flatnonzero(self._distances[:, col] != column)
+            if len(rows) > 0:
+                self._distances[rows, col] = column[rows]
+                changed = self._refresh_minimums(rows) or changed
+            return changed
+
+        # Only write if a table entry changed
+        if not np.array_equal(self._distances[dests, col], new_distances):
+            self._distances[dests, col] = new_distances
+            changed = self._refresh_minimums(dests) or changed
+        return changed
 
     
     def next_hop(self, dest:node_addr_t) -> node_pos_t|None:
@@ -126,83 +363,119 @@ class DistanceTbl:
         """
         if dest == self.my_addr:
             return self.my_addr
+
+        # Return None if this node does not know the destination
+        handle = self._addr_handles.get(dest)
+        if handle is None or handle >= len(self._min_distances):
+            return None
         
-        neighbor_addr = None
-        neighbor_cost = 0
-
-        # Determine the neighbor with the minimum link cost to the destination
-        if dest in self._distances:
-            dest_row = self._distances[dest]
-            for via, cost in dest_row.items():
-                if neighbor_addr is None or cost < neighbor_cost:
-                    neighbor_addr, neighbor_cost = via, cost
-
-        # Return None if neighbor could not be found
-        if neighbor_addr is None:
+        # The neighbor with the minimum link cost to the destination is tracked as the
+        # table is written
+        if self._min_distances[handle] == BMF_NO_ROUTE:
             return None
 
         # Return position of neighbor
-        neighbor_pos = self._neighbor_addr_pos[neighbor_addr]
-        return neighbor_pos
+        return self._neighbor_pos[self._best_cols[handle]]
+
+
+    def next_hop_dir(self, dest:node_addr_t) -> Direction|None:
+        """
+        Given a destination address, determine the direction of the neighbor which will
+        provide the lowest-cost path. Since the table's columns are neighbor directions,
+        no position arithmetic is needed.
+
+        :param dest: destination node address
+        :return: direction of the neighbor node, or None if this node is not aware of the
+        given destination or is the destination
+        """
+        handle = self._addr_handles.get(dest)
+        if handle is None or handle >= len(self._min_distances) or handle == self._my_handle:
+            return None
+        if self._min_distances[handle] == BMF_NO_ROUTE:
+            return None
+        return ALL_DIRECTIONS[self._best_cols[handle]]
     
 
-    def get_distance_vector(self) -> dict[node_addr_t, int]:
+    def get_distance_vector(self) -> tuple[np.ndarray, np.ndarray]:
         """
         Generate a distance vector that can be used to update neighbor nodes' distance
-        tables.
+        tables. The vector is only regenerated if the table has changed since the last
+        call; otherwise the same arrays are returned, so they must not be modified.
 
-        :return: mapping of destination addresses to their distances from this node
+        :return: sorted array of destination address handles and array of their
+        distances from this node
         """
-        dv = dict()
-        for dest, via_row in self._distances.items():
-            dv[dest] = min(via_row.values())
-        return dv
+        if self._dv_cache is None:
+            ids = np.flatnonzero(self._min_distances != BMF_NO_ROUTE).astype(np.int32)
+            costs = self._min_distances[ids]
+            # The arrays are shared by every neighbor that receives them, so lock them
+            ids.flags.writeable = False
+            costs.flags.writeable = False
+            self._dv_cache = (ids, costs)
+        return self._dv_cache
 
 
-class BellmanFordData:
-    """
-    Encapsulates a DistanceTbl with other state relevant for Bellman-Ford routing.
+    def mark_distance_vector_sent(self):
+        """
+        Record the current distances as already sent to the neighbor nodes, so that the
+        next distance vector delta only contains changes made after this call.
+        """
+        self._sent_distances[:] = self._min_distances
 
-    This class should be used for RoutingCube.data.
-    """
 
-    def __init__(self, my_addr:node_addr_t, my_pos:node_pos_t):
+    def get_distance_vector_delta(self) -> tuple[np.ndarray, np.ndarray]:
         """
-        Create new Bellman-Ford data with an empty distance table.
+        Generate a distance vector containing only the destinations whose distance from
+        this node changed since the last call. Destinations that became unreachable are
+        included with a distance of BMF_NO_ROUTE.
 
-        :param my_addr: address of the node that owns this data
+        :return: sorted array of destination address handles and array of their
+        distances from this node
         """
-        self.distance_tbl = DistanceTbl(my_addr, my_pos) # BMF distance table
-        self.last_dv = None # Last distance vector sent by this node
-        self.tx_data = None # BMFDataPkt to send from this node
+        ids = np.flatnonzero(self._min_distances != self._sent_distances).astype(np.int32)
+        costs = self._min_distances[ids]
+        self._sent_distances[ids] = costs
+        ids.flags.writeable = False
+        costs.flags.writeable = False
+        return ids, costs
 
 
-    def new_neighbor(self, addr:node_addr_t, pos:node_pos_t, link_cost:int):
-        """
-        Wrapper for DistanceTbl.new_neighbor().
-        """
-        return self.distance_tbl.new_neighbor(addr, pos, link_cost)
+class BellmanFordData(DistanceTbl):
+    """
+    Extends a DistanceTbl with other state relevant for Bellman-Ford routing. The table
+    methods are inherited, so routing code calls them on the data directly.
+
+    This class should be used for RoutingCube.data.
+    """
 
+    __slots__ = ("full_dv_countdown", "full_dvs_remaining", "full_dv_pkt", "nn_ack_pkt", "tx_data")
 
-    def update(self, distance_vector:dict[node_addr_t, int], via:node_addr_t, via_pos:node_pos_t):
+    def __init__(self, my_addr:node_addr_t, my_pos:node_pos_t, addr_handles:AddrHandles):
         """
-        Wrapper for DistanceTbl.update().
-        """
-        return self.distance_tbl.update(distance_vector, via, via_pos)
+        Create new Bellman-Ford data with an empty distance table.
 
+        :param my_addr: address of the node that owns this data
+        :param my_pos: coordinates of the node that owns this data
+        :param addr_handles: address handles of the simulation the node belongs to
+        """
+        super().__init__(my_addr, my_pos, addr_handles)
+        self.full_dv_countdown = 0  # Cycles until this node next sends a periodic full distance vector
+        self.full_dvs_remaining = 0 # Periodic full distance vectors left to send since the last change
+        self.full_dv_pkt = None # Last full distance vector packet sent by this node
+        self.nn_ack_pkt = BMFNewNeighborPkt(my_addr, None, ack=True) # Acknowledgement for new neighbor notifications with the default link cost
+        self.tx_data = None # BMFDataPkt to send from this node
 
-    def next_hop(self, dest:node_addr_t) -> node_pos_t|None:
-        """
-        Wrapper for DistanceTbl.next_hop().
-        """
-        return self.distance_tbl.next_hop(dest)
-    
 
-    def get_distance_vector(self) -> dict[node_addr_t, int]:
+    def schedule_full_dvs(self):
         """
-        Wrapper for DistanceTbl.get_distance_vector().
+        Schedule BMF_FULL_DV_REPEATS periodic full distance vectors after a change to this
+        node's distance vector. The first one is sent once the distance vector has not
+        changed for at least BMF_FULL_DV_INTERVAL cycles, so they are not sent while the
+        network is still converging. The delay is staggered by handle so that neighbors'
+        full vectors do not all arrive in the same cycle.
         """
-        return self.distance_tbl.get_distance_vector()
+        self.full_dvs_remaining = BMF_FULL_DV_REPEATS
+        self.full_dv_countdown = BMF_FULL_DV_INTERVAL + self._my_handle % BMF_FULL_DV_INTERVAL
 
 
 class BellmanFordRouting(RoutingAlgorithm):
@@ -211,15 +484,24 @@ class BellmanFordRouting(RoutingAlgorithm):
     """
     
     def __init__(self):
-        pass
+        # Address handles of the nodes routed by this algorithm, shared by their distance tables
+        self.addr_handles = AddrHandles()
+        # Handler for each packet type, called as handler(cube, pkt, rx_dir)
+        self._handlers = {
+            BMFNewNeighborPkt: self.handle_new_neighbor_pkt,
+            BMFDistanceVectorPkt: self.handle_distance_vector_pkt,
+            BMFDataPkt: self.handle_data_pkt,
+        }
     
 
-    def got_new_neighbor_notif(self, cube:RoutingCube, nn_pkt:BMFNewNeighborPkt, rx_dir:Direction):
+    @staticmethod
+    def got_new_neighbor_notif(cube:RoutingCube, nn_pkt:BMFNewNeighborPkt, rx_dir:Direction):
         """
         Handles a new neighbor notification by updating the BMF distance table in the
-        appropriate manner. If the given nn_pkt's ack attribute is not False, it will be
-        set to False, and the packet will be sent back to the neighbor node, causing its
-        distance table to be updated accordingly.
+        appropriate manner. If the given nn_pkt's ack attribute is False, an
+        acknowledgement packet will be sent back to the neighbor node, causing its
+        distance table to be updated accordingly. The received packet is not modified,
+        since the same notification is shared by all of the sender's neighbors.
 
         :param cube: RoutingCube to operate on
         :param nn_pkt: neighbor notification packet that was received
@@ -231,59 +513,78 @@ class BellmanFordRouting(RoutingAlgorithm):
         # Add neighbor to distance table
         cube.data.new_neighbor(nn_pkt.src_addr, neighbor_pos, nn_pkt.link_cost)
 
-        # If this is not an Ack, acknowledge the neighbor by sending the packet back
+        # If this is not an Ack, acknowledge the neighbor (the cube's prebuilt ack can be
+        # shared since packets are never modified after they are sent)
         if not nn_pkt.ack:
-            nn_pkt.src_addr = cube.id
-            nn_pkt.ack = True
-            cube.send_packet(determine_tx_dir(cube.position, neighbor_pos), nn_pkt)
+            ack_pkt = cube.data.nn_ack_pkt
+            if nn_pkt.link_cost != ack_pkt.link_cost:
+                ack_pkt = BMFNewNeighborPkt(cube.id, None, nn_pkt.link_cost, ack=True)
+            cube.send_packet(rx_dir, ack_pkt)
 
 
-    def send_new_neighbor_notif(self, cube:RoutingCube):
+    @staticmethod
+    def send_new_neighbor_notif(cube:RoutingCube):
         """
         Generate and send a new neighbor notification packet in all directions at once.
 
         :param cube: RoutingCube to operate on
         """
-        # Notify all neighbors
-        for d in list(Direction):
-            # Create new neighbor notification packet
-            nn_pkt = BMFNewNeighborPkt(cube.id, None)
-            cube.send_packet(d, nn_pkt)
+        # Create new neighbor notification packet and notify all neighbors
+        nn_pkt = BMFNewNeighborPkt(cube.id, None)
+        cube.broadcast(nn_pkt)
 
 
-    def update_distance_tbl(self, cube:RoutingCube, dv_pkt:BMFDistanceVectorPkt, rx_dir:Direction):
+    @staticmethod
+    def update_distance_tbl(cube:RoutingCube, dv_pkt:BMFDistanceVectorPkt, rx_dir:Direction) -> bool:
         """
         Update the cube's distance table with a distance vector from a neighbor node.
 
         :param cube: RoutingCube to operate on
         :param neighbor_addr: neighbor node address
         :param rx_dir: direction from which the packet was received
+        :return: True if the cube's distance vector changed, otherwise False
         """
         # Get neighbor position
         neighbor_pos = determine_tx_pos(cube.position, rx_dir)
         # Update distance table
-        cube.data.update(dv_pkt.vector, dv_pkt.src_addr, neighbor_pos)
+        return cube.data.update(dv_pkt.ids, dv_pkt.costs, dv_pkt.src_addr, neighbor_pos, dv_pkt.full)
 
 
-    def update_neighbors(self, cube:RoutingCube):
+    @staticmethod
+    def update_neighbors(cube:RoutingCube, full:bool=False):
         """
-        Generate and send a distance vector packet in all directions at once. The new
-        distance vector will only be sent if it is different from the last distance
-        vector sent; otherwise, this method does nothing.
+        Generate and send a distance vector packet in all directions at once. Normally
+        only the entries that changed since the last distance vector are sent, and
+        nothing is sent if none changed.
 
         :param cube: RoutingCube to operate on
-        """
-        # Create distance vector packet
-        dv_pkt = BMFDistanceVectorPkt(cube.id, None, cube.data.get_distance_vector())
+        :param full: send the full distance vector instead, even if nothing changed
+        """
+        # The full vector also covers every change, so the delta is consumed either way
+        ids, costs = cube.data.get_distance_vector_delta()
+        if len(ids) > 0:
+            # Follow the change with periodic full vectors in case the delta is dropped
+            cube.data.schedule_full_dvs()
+
+        if full:
+            ids, costs = cube.data.get_distance_vector()
+            # Resend the previous full vector packet if the table has not changed since;
+            # packets are never modified after they are sent, so sharing it is safe
+            dv_pkt = cube.data.full_dv_pkt
+            if dv_pkt is None or dv_pkt.ids is not ids:
+                dv_pkt = cube.data.full_dv_pkt = BMFDistanceVectorPkt(cube.id, None, ids, costs, full=True)
+        elif len(ids) == 0:
+            # Only update neighbors if distance table has not converged
+            return
+        else:
+            # Create distance vector packet
+            dv_pkt = BMFDistanceVectorPkt(cube.id, None, ids, costs)
 
-        # Only update neighbors if distance table has not converged
-        if cube.data.last_dv != dv_pkt.vector:
-            for d in list(Direction):
-                cube.send_packet(d, dv_pkt)
-            cube.data.last_dv = dv_pkt.vector
+        cube.broadcast(dv_pkt)
 
 
-    def route_pkt(self, cube:RoutingCube, pkt:BMFDataPkt):
+    @staticmethod
+    def route_pkt(cube:RoutingCube, pkt:BMFDataPkt):
         """
         Helper method for routing the given packet to the appropriate neighbor to reach
         its destination. If this cube is the packet's destination, this method does
@@ -297,17 +598,43 @@ class BellmanFordRouting(RoutingAlgorithm):
             return
         
         # Route the packet toward the destination using Bellman Ford
-        next_hop = cube.data.next_hop(pkt.dest_addr)
-        if next_hop is None:
+        tx_dir = cube.data.next_hop_dir(pkt.dest_addr)
+        if tx_dir is None:
             # This cube does not know a route to the destination
             cube.num_pkts_dropped += 1
             return
         
         # Send the packet in the appropriate direction
-        tx_dir = determine_tx_dir(cube.position, next_hop)
         cube.send_packet(tx_dir, pkt)
 
 
+    def handle_new_neighbor_pkt(self, cube:RoutingCube, pkt:BMFNewNeighborPkt, rx_dir:Direction) -> DVUpdate:
+        """
+        Cube got notified of new neighbor node - add the neighbor and send the full distance
+        vector, since the neighbor has not seen any of this node's previous deltas.
+        """
+        self.got_new_neighbor_notif(cube, pkt, rx_dir)
+        return DVUpdate.FULL
+
+
+    def handle_distance_vector_pkt(self, cube:RoutingCube, pkt:BMFDistanceVectorPkt, rx_dir:Direction) -> DVUpdate:
+        """
+        Cube received distance vector from node - update table and send distance vector if
+        the table update changed it.
+        """
+        if self.update_distance_tbl(cube, pkt, rx_dir):
+            return DVUpdate.DELTA
+        return DVUpdate.NONE
+
+
+    def handle_data_pkt(self, cube:RoutingCube, pkt:BMFDataPkt, rx_dir:Direction) -> DVUpdate:
+        """
+        Cube received data packet with a destination address.
+        """
+        self.route_pkt(cube, pkt)
+        return DVUpdate.NONE
+
+
     def route(self, cube:RoutingCube):
         """
         Perform one cycle of Bellman-Ford routing.
@@ -316,26 +643,30 @@ class BellmanFordRouting(RoutingAlgorithm):
         :raises TypeError: if this cube receives a packet of an invalid type
         :return: cube
         """
-        # Get a packet received by the cube
-        pkt, rx_dir = cube.get_packet()
-
-        if pkt is not None:
-            if isinstance(pkt, BMFNewNeighborPkt):
-                # Cube got notified of new neighbor node - add the neighbor and send distance vector
-                self.got_new_neighbor_notif(cube, pkt, rx_dir)
-                self.update_neighbors(cube)
-            
-            elif isinstance(pkt, BMFDistanceVectorPkt):
-                # Cube received distance vector from node - update table and send distance vector
-                self.update_distance_tbl(cube, pkt, rx_dir)
-                self.update_neighbors(cube)
-
-            elif isinstance(pkt, BMFDataPkt):
-                # Cube received data packet with a destination address
-                self.route_pkt(cube, pkt)
-
-            else:
-                raise TypeError(f"Bad packet type: {type(pkt)}")
+        # Handle the packets received by the cube this cycle, dispatching on the exact
+        # packet type (most cubes have an empty queue in most cycles, so skip draining then)
+        dv_update = DVUpdate.NONE
+        if cube.has_packet():
+            for pkt, rx_dir in cube.drain_packets(BMF_MAX_PKTS_PER_CYCLE):
+                try:
+                    handler = self._handlers[type(pkt)]
+                except KeyError:
+                    raise TypeError(f"Bad packet type: {type(pkt)}")
+                dv_update = max(dv_update, handler(cube, pkt, rx_dir))
+
+        # For a while after the distance vector last changed, periodically send the full
+        # vector even if nothing else changed, so that neighbors recover from dropped
+        # deltas; a network that has converged goes quiet once these run out
+        if cube.data.full_dvs_remaining > 0:
+            cube.data.full_dv_countdown -= 1
+            if cube.data.full_dv_countdown == 0:
+                cube.data.full_dv_countdown = BMF_FULL_DV_INTERVAL
+                cube.data.full_dvs_remaining -= 1
+                dv_update = DVUpdate.FULL
+
+        # Send at most one distance vector for all of the packets handled
+        if dv_update:
+            self.update_neighbors(cube, full=dv_update == DVUpdate.FULL)
             
         # Transmit a packet generated by this cube if one exists
         if cube.data.tx_data is not None:
@@ -352,9 +683,18 @@ class BellmanFordRouting(RoutingAlgorithm):
 
         :param cube: RoutingCube to operate on
         """
-        cube.data = BellmanFordData(cube.id, cube.position)
+        cube.data = BellmanFordData(cube.id, cube.position, self.addr_handles)
         self.send_new_neighbor_notif(cube)
 
+
+    def power_off(self, cube:RoutingCube):
+        """
+        Release the handle of the cube's address, since it is leaving the network.
+
+        :param cube: RoutingCube to operate on
+        """
+        self.addr_handles.release(cube.id)
+
     
     def send_packet(self, cube:RoutingCube, dest_addr:node_addr_t, data:typing.Any):
         """
@@ -375,15 +715,20 @@ class BellmanFordRobot(RobotAlgorithm):
     a RoutingCube using the BellmanFordRouting algorithm.
     """
 
-    CUBE_ROUTING_ALGO = BellmanFordRouting()
-
-    def __init__(self):
-        pass
+    def __init__(self, cube_routing_algo:BellmanFordRouting|None=None):
+        """
+        :param cube_routing_algo: routing algorithm of the network the robots belong to,
+                                  whose address handles the robots' cubes share; a new
+                                  one is created if not given
+        """
+        if cube_routing_algo is None:
+            cube_routing_algo = BellmanFordRouting()
+        self.cube_routing_algo = cube_routing_algo
 
 
     def step(self, robot: Robot) -> RoutingCube:
-        BellmanFordRobot.CUBE_ROUTING_ALGO.route(robot.cube)
+        self.cube_routing_algo.route(robot.cube)
         
 
     def power_on(self, robot: Robot):
-        BellmanFordRobot.CUBE_ROUTING_ALGO.power_on(robot.cube)
+        self.cube_routing_algo.power_on(robot.cube)
@@ -0,0 +1,101 @@
+"""Batched Bellman-Ford Relaxation
+
+file: bellmanford_batched.py
+
+Computes the converged result of Bellman-Ford routing for a whole network at once, as a
+single distance matrix relaxed with NumPy, instead of exchanging distance vectors between
+cubes one simulation cycle at a time. Only the rows of cubes that have a neighbor whose
+distances changed in the previous pass are relaxed again, so relaxation stops as soon as
+no distance changes.
+
+The result can be used to seed every cube's Bellman-Ford distance table so that a
+simulation starts from a converged network.
+"""
+
+import numpy as np
+
+from network.faces import ALL_DIRECTIONS
+from network.network_grid import NetworkGrid
+from routing_algorithms.bellmanford import BMF_DEFAULT_LINK_COST, BMF_NO_ROUTE, BellmanFordData
+from routing_algorithms.helpers import determine_tx_pos
+
+_RELAX_INF = 2**30 # Distance used for unreachable nodes during relaxation; adding a link cost to it cannot overflow int32
+
+
+def neighbor_indices(grid:NetworkGrid) -> np.ndarray:
+    """
+    Build the adjacency of the grid's nodes as an array with one row per node (in
+    grid.node_list order) and one column per direction (indexed by Direction.value).
+
+    :param grid: network grid
+    :return: index of the neighbor node in each direction, or -1 where there is none
+    """
+    index = {node.position: i for i, node in enumerate(grid.node_list)}
+    neighbors = np.full((len(grid.node_list), len(ALL_DIRECTIONS)), -1, dtype=np.intp)
+    for i, node in enumerate(grid.node_list):
+        for d in ALL_DIRECTIONS:
+            neighbors[i, d.value] = index.get(determine_tx_pos(node.position, d), -1)
+    return neighbors
+
+
+def relax(neighbors:np.ndarray, link_cost:int=BMF_DEFAULT_LINK_COST) -> np.ndarray:
+    """
+    Run Bellman-Ford relaxation over all nodes at once until no distance changes.
+
+    :param neighbors: adjacency array returned by neighbor_indices()
+    :param link_cost: cost of every link
+    :return: matrix where entry [i, j] is the distance from node i to node j, or
+    BMF_NO_ROUTE if node j cannot be reached from node i
+    """
+    num_nodes = len(neighbors)
+    distances = np.full((num_nodes, num_nodes), _RELAX_INF, dtype=np.int32)
+    np.fill_diagonal(distances, 0)
+    has_neighbor = neighbors >= 0
+
+    changed = np.ones(num_nodes, dtype=bool)
+    while changed.any():
+        # Only nodes next to a node whose distances changed can improve
+        rows = np.flatnonzero((has_neighbor & changed[neighbors]).any(axis=1))
+        relaxed = distances[rows]
+        for col in range(neighbors.shape[1]):
+            valid = has_neighbor[rows, col]
+            via = neighbors[rows[valid], col]
+            relaxed[valid] = np.minimum(relaxed[valid], distances[via] + link_cost)
+
+        changed[:] = False
+        changed[rows] = (relaxed != distances[rows]).any(axis=1)
+        distances[rows] = relaxed
+
+    distances[distances >= _RELAX_INF] = BMF_NO_ROUTE
+    return distances
+
+
+def seed_distance_tables(grid:NetworkGrid):
+    """
+    Fill the distance table of every powered-on Bellman-Ford cube in the grid with the
+    distance vectors its neighbors would have once the network has converged. All links
+    are assumed to have the default link cost. The seeded distances are treated as
+    already sent, since every neighbor is seeded with them as well.
+
+    :param grid: network grid whose routing algorithm is Bellman-Ford
+    """
+    neighbors = neighbor_indices(grid)
+    distances = relax(neighbors)
+    addr_handles = grid.routing_algorithm.addr_handles
+    ids = np.array([addr_handles.assign(node.id) for node in grid.node_list], dtype=np.int32)
+    # The tables expect distance vectors sorted by handle
+    order = np.argsort(ids)
+    ids = ids[order]
+    ids.flags.writeable = False
+
+    for i, node in enumerate(grid.node_list):
+        if not isinstance(node.data, BellmanFordData):
+            continue
+        for via in neighbors[i]:
+            if via < 0:
+                continue
+            via_node = grid.node_list[via]
+            costs = distances[via, order]
+            reachable = costs != BMF_NO_ROUTE
+            node.data.update(ids[reachable], costs[reachable], via_node.id, via_node.position)
+        node.data.mark_distance_vector_sent()
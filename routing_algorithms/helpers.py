@@ -12,6 +12,19 @@ node_addr_t: typing.TypeAlias = int|str
 node_pos_t: typing.TypeAlias = tuple[int|int|int]
 
 
+# Position offset of the neighbor node in each direction, indexed by Direction.value
+_DIR_DELTAS: tuple[node_pos_t, ...] = (
+    (0, 0, 1),  # UP
+    (0, 0, -1), # DOWN
+    (-1, 0, 0), # WEST
+    (1, 0, 0),  # EAST
+    (0, 1, 0),  # NORTH
+    (0, -1, 0), # SOUTH
+)
+# Direction of the neighbor node at each position offset
+_DELTA_DIRS: dict[node_pos_t, Direction] = {delta: d for d, delta in zip(Direction, _DIR_DELTAS)}
+
+
 def determine_tx_pos(my_pos:node_pos_t, rx_dir:Direction) -> node_pos_t:
     """
     Helper function for determining the position of a neighbor node that sent a packet
@@ -22,19 +35,8 @@ def determine_tx_pos(my_pos:node_pos_t, rx_dir:Direction) -> node_pos_t:
     :return: address of neighbor node
     """
     x, y, z = my_pos
-    if rx_dir == Direction.UP:
-        z += 1
-    elif rx_dir == Direction.DOWN:
-        z -= 1
-    elif rx_dir == Direction.WEST:
-        x -= 1
-    elif rx_dir == Direction.EAST:
-        x += 1
-    elif rx_dir == Direction.NORTH:
-        y += 1
-    elif rx_dir == Direction.SOUTH:
-        y -= 1
-    return x, y, z
+    dx, dy, dz = _DIR_DELTAS[rx_dir.value]
+    return x + dx, y + dy, z + dz
 
 
 def determine_tx_dir(my_pos:node_pos_t, neighbor_pos:node_pos_t) -> Direction|None:
@@ -49,20 +51,4 @@ def determine_tx_dir(my_pos:node_pos_t, neighbor_pos:node_pos_t) -> Direction|No
     """
     src_x, src_y, src_z = my_pos
     dest_x, dest_y, dest_z = neighbor_pos
-
-    if dest_x == src_x + 1:
-        dir = Direction.EAST
-    elif dest_x == src_x - 1:
-        dir = Direction.WEST
-    elif dest_y == src_y + 1:
-        dir = Direction.NORTH
-    elif dest_y == src_y - 1:
-        dir = Direction.SOUTH
-    elif dest_z == src_z + 1:
-        dir = Direction.UP
-    elif dest_z == src_z - 1:
-        dir = Direction.DOWN
-    else:
-        dir = None
-        
-    return dir
+    return _DELTA_DIRS.get((dest_x - src_x, dest_y - src_y, dest_z - src_z))
@@ -17,6 +17,10 @@ class RoutingAlgorithm:
     def power_on(self, cube: RoutingCube) -> None:
         pass
 
+    # Called once when this cube is removed from the network.
+    def power_off(self, cube: RoutingCube) -> None:
+        pass
+
     # Called when a packet transmission needs to be simulated.
     def send_packet(self, cube: RoutingCube, dest_addr, data) -> None:
         pass
@@ -3,7 +3,7 @@
 """
 
 from network.routing_cube import RoutingCube
-from network.faces import Direction
+from network.faces import OPPOSITE_DIRECTIONS
 from .routing_algorithm import RoutingAlgorithm
 
 # example of how to use the RoutingAlgorithm class
@@ -18,18 +18,7 @@ class Template(RoutingAlgorithm):
         packet, rx_dir = cube.get_packet()
 
         if packet is not None:
-            if rx_dir == Direction.UP:
-                cube.send_packet(Direction.DOWN, packet)
-            elif rx_dir == Direction.DOWN:
-                cube.send_packet(Direction.UP, packet)
-            if rx_dir == Direction.NORTH:
-                cube.send_packet(Direction.SOUTH, packet)
-            elif rx_dir == Direction.SOUTH:
-                cube.send_packet(Direction.NORTH, packet)
-            if rx_dir == Direction.EAST:
-                cube.send_packet(Direction.WEST, packet)
-            elif rx_dir == Direction.WEST:
-                cube.send_packet(Direction.EAST, packet)
+            cube.send_packet(OPPOSITE_DIRECTIONS[rx_dir.value], packet)
         
         return cube
     